@@ -7,23 +7,26 @@
 #- Robust unload handling. 
 #FILE DESCRIPTION: Integration bootstrap: validates config entry data, creates and registers the DataUpdateCoordinator, forwards platform setup and handles unload. 
 #DEPENDENCIES:
-#- imports: homeassistant.const CONF_*, coordinator.FwcamDataUpdateCoordinator, .const DOMAIN
+#- imports: homeassistant.const CONF_*, coordinator.FwcamDataUpdateCoordinator/FwcamRuntimeData, .const DEFAULT_RADIUS
 
 from __future__ import annotations
 
 import logging
 from typing import Final
 
-from homeassistant.core import HomeAssistant
-from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CoreState, HomeAssistant, callback
 from homeassistant.const import Platform, CONF_LATITUDE, CONF_LONGITUDE, CONF_RADIUS
+from homeassistant.helpers.start import async_at_started
 
-from .const import DOMAIN
-from .coordinator import FwcamDataUpdateCoordinator
+from .const import DEFAULT_RADIUS
+from .coordinator import FwcamConfigEntry, FwcamDataUpdateCoordinator, FwcamRuntimeData
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS: Final = [Platform.SENSOR]
+PLATFORMS: Final[tuple[Platform, ...]] = (Platform.SENSOR,)
+
+# Keys stored explicitly in the runtime config; everything else is copied through
+_EXCLUDED_KEYS: Final = frozenset({CONF_LATITUDE, CONF_LONGITUDE, CONF_RADIUS})
 
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
@@ -31,65 +34,54 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     return True
 
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    _LOGGER.info("Setting up FWCAM integration (entry_id=%s)", entry.entry_id)
-    try:
-        hass.data.setdefault(DOMAIN, {})
-        hass.data[DOMAIN].setdefault(entry.entry_id, {})
+async def async_setup_entry(hass: HomeAssistant, entry: FwcamConfigEntry) -> bool:
+    _LOGGER.debug("Setting up FWCAM integration (entry_id=%s)", entry.entry_id)
 
-        latitude = entry.data.get(CONF_LATITUDE, hass.config.latitude)
-        longitude = entry.data.get(CONF_LONGITUDE, hass.config.longitude)
-        radius = entry.data.get(CONF_RADIUS, 5)
+    # Types were validated and coerced by the config flow
+    latitude: float | None = entry.data.get(CONF_LATITUDE)
+    longitude: float | None = entry.data.get(CONF_LONGITUDE)
+    radius: int = entry.data.get(CONF_RADIUS, DEFAULT_RADIUS)
 
-        if latitude is None or longitude is None:
-            _LOGGER.error(
-                "FWCAM async_setup_entry: missing coordinates in config entry (entry_id=%s). Reconfigure integration.",
-                entry.entry_id,
-            )
-            return False
-
-        try:
-            latitude = float(latitude)
-            longitude = float(longitude)
-            radius = int(radius)
-        except Exception:
-            _LOGGER.exception("FWCAM async_setup_entry: invalid types for latitude/longitude/radius")
-            return False
-
-        hass.data[DOMAIN][entry.entry_id]["config"] = {
-            "latitude": latitude,
-            "longitude": longitude,
-            "radius": radius,
-            **{k: v for k, v in entry.data.items() if k not in (CONF_LATITUDE, CONF_LONGITUDE, CONF_RADIUS)},
-        }
-
-        coordinator = FwcamDataUpdateCoordinator(hass, entry)
-        hass.data[DOMAIN][entry.entry_id]["coordinator"] = coordinator
-
-        await coordinator.async_config_entry_first_refresh()
-
-        for platform in PLATFORMS:
-            hass.async_create_task(hass.config_entries.async_forward_entry_setup(entry, platform))
-
-        _LOGGER.debug("FWCAM coordinator registered and platforms forwarded.")
-        return True
-    except Exception as exc:
-        _LOGGER.exception("FWCAM async_setup_entry failed: %s", exc)
+    if latitude is None or longitude is None:
+        _LOGGER.warning(
+            "FWCAM async_setup_entry: missing coordinates in config entry (entry_id=%s). Reconfigure integration.",
+            entry.entry_id,
+        )
         return False
 
+    extra = {k: entry.data[k] for k in entry.data.keys() - _EXCLUDED_KEYS}
+    config = {
+        CONF_LATITUDE: latitude,
+        CONF_LONGITUDE: longitude,
+        CONF_RADIUS: radius,
+        **extra,
+    }
+    coordinator = FwcamDataUpdateCoordinator(hass, entry, config)
+    entry.runtime_data = FwcamRuntimeData(coordinator=coordinator, config=config)
+    entry.async_on_unload(coordinator.async_shutdown)
+
+    # Runs the coordinator's one-time _async_setup. During Home Assistant startup
+    # the first refresh only yields the placeholder snapshot and sensors keep
+    # their placeholder values until startup has finished and the refresh
+    # below has run. Entries set up while Home Assistant is running fetch here.
+    await coordinator.async_config_entry_first_refresh()
+
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    if hass.state is not CoreState.running:
+
+        @callback
+        def _async_start_refresh(_hass: HomeAssistant) -> None:
+            hass.async_create_background_task(
+                coordinator.async_request_refresh(), "fwcam-initial-refresh"
+            )
+
+        entry.async_on_unload(async_at_started(hass, _async_start_refresh))
+
+    _LOGGER.debug("FWCAM coordinator registered and platforms forwarded.")
+    return True
+
 
-async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    _LOGGER.info("Unloading FWCAM integration (entry_id=%s)", entry.entry_id)
-    results = []
-    for platform in PLATFORMS:
-        try:
-            res = await hass.config_entries.async_forward_entry_unload(entry, platform)
-            results.append(bool(res))
-        except Exception:
-            _LOGGER.exception("Error unloading platform %s for entry %s", platform, entry.entry_id)
-            results.append(False)
-
-    unload_ok = all(results)
-    hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
-    _LOGGER.debug("FWCAM unloaded (entry_id=%s) unload_ok=%s", entry.entry_id, unload_ok)
-    return unload_ok
+async def async_unload_entry(hass: HomeAssistant, entry: FwcamConfigEntry) -> bool:
+    _LOGGER.debug("Unloading FWCAM integration (entry_id=%s)", entry.entry_id)
+    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
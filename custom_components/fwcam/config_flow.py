@@ -8,21 +8,89 @@
 #- Defensive logging and clear aborts on unexpected errors. 
 # FILE DESCRIPTION: ConfigFlow for FWCAM: collects required coordinates and options, validates input and creates a config entry safe for async_setup_entry. 
 # DEPENDENCIES:
-#- runtime import of voluptuous inside flow methods
+#- voluptuous (imported at module load, shared validators)
 #- homeassistant.config_entries and homeassistant.const
 #- uses .const for default keys
 
 from __future__ import annotations
 
 import logging
-from typing import Any
+from collections import ChainMap
+from functools import cached_property
+from typing import Any, Final
+
+import voluptuous as vol
 
 from homeassistant import config_entries
+from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE, CONF_RADIUS
 from homeassistant.data_entry_flow import FlowResult
 
+from .const import (
+    CONF_FUEL_TYPE,
+    CONF_NOTIFY_CHANNELS,
+    CONF_TANKERKOENIG_API_KEY,
+    DEFAULT_FUEL_TYPE,
+    DEFAULT_RADIUS,
+    DEFAULT_NOTIFY_CHANNELS,
+    DOMAIN,
+    FUEL_TYPE_OPTIONS,
+)
+
 _LOGGER = logging.getLogger(__name__)
 
-DOMAIN = "fwcam"
+# Fallbacks when neither the entry options nor its data hold a value
+_DEFAULTS: Final = {
+    CONF_RADIUS: DEFAULT_RADIUS,
+    CONF_FUEL_TYPE: DEFAULT_FUEL_TYPE,
+    CONF_TANKERKOENIG_API_KEY: "",
+    CONF_NOTIFY_CHANNELS: DEFAULT_NOTIFY_CHANNELS,
+}
+
+_LAT_RANGE = vol.Range(min=-90, max=90)
+_LON_RANGE = vol.Range(min=-180, max=180)
+
+# Validators shared by the user and options flows
+_OPTIONS_VALIDATORS = {
+    CONF_LATITUDE: vol.All(vol.Coerce(float), _LAT_RANGE),
+    CONF_LONGITUDE: vol.All(vol.Coerce(float), _LON_RANGE),
+    CONF_RADIUS: vol.Coerce(int),
+    CONF_FUEL_TYPE: vol.In(FUEL_TYPE_OPTIONS),
+    CONF_TANKERKOENIG_API_KEY: str,
+    CONF_NOTIFY_CHANNELS: list,
+}
+
+
+def _build_user_schema(default_lat: float | None, default_lon: float | None) -> vol.Schema:
+    return vol.Schema(
+        {
+            vol.Optional(CONF_LATITUDE, default=default_lat): _OPTIONS_VALIDATORS[CONF_LATITUDE],
+            vol.Optional(CONF_LONGITUDE, default=default_lon): _OPTIONS_VALIDATORS[CONF_LONGITUDE],
+            vol.Optional(CONF_RADIUS, default=DEFAULT_RADIUS): _OPTIONS_VALIDATORS[CONF_RADIUS],
+            vol.Optional(CONF_FUEL_TYPE, default=DEFAULT_FUEL_TYPE): _OPTIONS_VALIDATORS[CONF_FUEL_TYPE],
+            vol.Required(CONF_TANKERKOENIG_API_KEY): _OPTIONS_VALIDATORS[CONF_TANKERKOENIG_API_KEY],
+            vol.Optional(CONF_NOTIFY_CHANNELS, default=list(DEFAULT_NOTIFY_CHANNELS)): _OPTIONS_VALIDATORS[CONF_NOTIFY_CHANNELS],
+        }
+    )
+
+
+def _build_options_schema(
+    lat: float | None,
+    lon: float | None,
+    radius: int,
+    fuel_type: str,
+    api_key: str,
+    channels: tuple[str, ...],
+) -> vol.Schema:
+    return vol.Schema(
+        {
+            vol.Optional(CONF_LATITUDE, default=lat): _OPTIONS_VALIDATORS[CONF_LATITUDE],
+            vol.Optional(CONF_LONGITUDE, default=lon): _OPTIONS_VALIDATORS[CONF_LONGITUDE],
+            vol.Optional(CONF_RADIUS, default=radius): _OPTIONS_VALIDATORS[CONF_RADIUS],
+            vol.Optional(CONF_FUEL_TYPE, default=fuel_type): _OPTIONS_VALIDATORS[CONF_FUEL_TYPE],
+            vol.Optional(CONF_TANKERKOENIG_API_KEY, default=api_key): _OPTIONS_VALIDATORS[CONF_TANKERKOENIG_API_KEY],
+            vol.Optional(CONF_NOTIFY_CHANNELS, default=list(channels)): _OPTIONS_VALIDATORS[CONF_NOTIFY_CHANNELS],
+        }
+    )
 
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -30,39 +98,26 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
-    async def async_step_user(self, user_input: dict[str, Any] | None = None) -> FlowResult:
-        _LOGGER.debug("FWCAM config_flow: async_step_user called with input: %s", user_input)
-        try:
-            from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE, CONF_RADIUS
-            from .const import (
-                CONF_FUEL_TYPE,
-                CONF_NOTIFY_CHANNELS,
-                DEFAULT_FUEL_TYPE,
-                DEFAULT_RADIUS,
-                DEFAULT_NOTIFY_CHANNELS,
-            )
-            import voluptuous as vol
-        except Exception as exc:
-            _LOGGER.exception("FWCAM config_flow: failed to import runtime dependencies: %s", exc)
-            return self.async_abort(reason="unknown")
-
+    @cached_property
+    def _defaults(self) -> tuple[float | None, float | None]:
+        """Home Assistant location used as form default, resolved once per flow."""
         try:
             default_lat = float(self.hass.config.latitude) if self.hass.config.latitude is not None else None
             default_lon = float(self.hass.config.longitude) if self.hass.config.longitude is not None else None
-        except Exception:
-            default_lat = None
-            default_lon = None
-
-        schema = vol.Schema(
-            {
-                vol.Optional(CONF_LATITUDE, default=default_lat): vol.Coerce(float),
-                vol.Optional(CONF_LONGITUDE, default=default_lon): vol.Coerce(float),
-                vol.Optional(CONF_RADIUS, default=DEFAULT_RADIUS): vol.Coerce(int),
-                vol.Optional(CONF_FUEL_TYPE, default=DEFAULT_FUEL_TYPE): vol.In(FUEL_TYPE_OPTIONS),
-                vol.Required(CONF_TANKERKOENIG_API_KEY): str,
-                vol.Optional(CONF_NOTIFY_CHANNELS, default=DEFAULT_NOTIFY_CHANNELS): list,
-            }
-        )
+        except (TypeError, ValueError):
+            return None, None
+        return default_lat, default_lon
+
+    @cached_property
+    def _user_schema(self) -> vol.Schema:
+        """User step schema, compiled once per flow."""
+        return _build_user_schema(*self._defaults)
+
+    async def async_step_user(self, user_input: dict[str, Any] | None = None) -> FlowResult:
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("FWCAM config_flow: async_step_user called with input: %s", user_input)
+
+        schema = self._user_schema
 
         if user_input is None:
             return self.async_show_form(step_id="user", data_schema=schema)
@@ -75,17 +130,8 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors["base"] = "missing_coordinates"
             return self.async_show_form(step_id="user", data_schema=schema, errors=errors)
 
-        # Validate coordinate ranges (vol.Coerce already converted to float)
-        if not (-90 <= lat <= 90) or not (-180 <= lon <= 180):
-            errors["base"] = "invalid_coordinates"
-            return self.async_show_form(step_id="user", data_schema=schema, errors=errors)
-
-        try:
-            await self.async_set_unique_id("fwcam_default")
-            self._abort_if_unique_id_configured()
-        except Exception as exc:
-            _LOGGER.debug("FWCAM config_flow: unique id check exception: %s", exc)
-            return self.async_abort(reason="already_configured")
+        await self.async_set_unique_id("fwcam_default")
+        self._abort_if_unique_id_configured()
 
         entry_data = {
             CONF_LATITUDE: lat,
@@ -93,10 +139,11 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             CONF_RADIUS: user_input.get(CONF_RADIUS, DEFAULT_RADIUS),
             CONF_FUEL_TYPE: user_input.get(CONF_FUEL_TYPE, DEFAULT_FUEL_TYPE),
             CONF_TANKERKOENIG_API_KEY: user_input.get(CONF_TANKERKOENIG_API_KEY, ""),
-            CONF_NOTIFY_CHANNELS: user_input.get(CONF_NOTIFY_CHANNELS, DEFAULT_NOTIFY_CHANNELS),
+            CONF_NOTIFY_CHANNELS: user_input.get(CONF_NOTIFY_CHANNELS, list(DEFAULT_NOTIFY_CHANNELS)),
         }
 
-        _LOGGER.debug("FWCAM config_flow: creating entry with data: %s", entry_data)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("FWCAM config_flow: creating entry with data: %s", entry_data)
         return self.async_create_entry(title="Fuel Watcher Car Advanced Manager", data=entry_data)
 
     @staticmethod
@@ -107,40 +154,37 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 class OptionsFlowHandler(config_entries.OptionsFlow):
     def __init__(self, config_entry):
         self.config_entry = config_entry
-        _LOGGER.debug("FWCAM options flow initialized for entry_id=%s", getattr(config_entry, "entry_id", None))
+        self._options_schema_key: tuple | None = None
+        self._options_schema: vol.Schema | None = None
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("FWCAM options flow initialized for entry_id=%s", getattr(config_entry, "entry_id", None))
+
+    def _get_options_schema(self) -> vol.Schema:
+        """Return the options schema, recompiled only when its defaults change."""
+        # Options override entry data, which overrides the integration defaults
+        merged = ChainMap(self.config_entry.options or {}, self.config_entry.data, _DEFAULTS)
+        key = (
+            merged.get(CONF_LATITUDE),
+            merged.get(CONF_LONGITUDE),
+            merged[CONF_RADIUS],
+            merged[CONF_FUEL_TYPE],
+            merged[CONF_TANKERKOENIG_API_KEY],
+            tuple(merged[CONF_NOTIFY_CHANNELS]),
+        )
+        if key != self._options_schema_key:
+            self._options_schema = _build_options_schema(*key)
+            self._options_schema_key = key
+        return self._options_schema
 
     async def async_step_init(self, user_input: dict[str, Any] | None = None) -> FlowResult:
-        _LOGGER.debug("FWCAM options flow: async_step_init called with input: %s", user_input)
-        try:
-            from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE, CONF_RADIUS
-            from .const import (
-                CONF_FUEL_TYPE,
-                CONF_NOTIFY_CHANNELS,
-                CONF_TANKERKOENIG_API_KEY,
-                DEFAULT_FUEL_TYPE,
-                DEFAULT_RADIUS,
-                DEFAULT_NOTIFY_CHANNELS,
-                FUEL_TYPE_OPTIONS,
-            )
-            import voluptuous as vol
-        except Exception as exc:
-            _LOGGER.exception("FWCAM options flow: failed to import runtime dependencies: %s", exc)
-            return self.async_abort(reason="unknown")
-
-        current = self.config_entry.options or {}
-        schema = vol.Schema(
-            {
-                vol.Optional(CONF_LATITUDE, default=current.get(CONF_LATITUDE, self.config_entry.data.get(CONF_LATITUDE))): vol.Coerce(float),
-                vol.Optional(CONF_LONGITUDE, default=current.get(CONF_LONGITUDE, self.config_entry.data.get(CONF_LONGITUDE))): vol.Coerce(float),
-                vol.Optional(CONF_RADIUS, default=current.get(CONF_RADIUS, self.config_entry.data.get(CONF_RADIUS, DEFAULT_RADIUS))): vol.Coerce(int),
-                vol.Optional(CONF_FUEL_TYPE, default=current.get(CONF_FUEL_TYPE, self.config_entry.data.get(CONF_FUEL_TYPE, DEFAULT_FUEL_TYPE))): vol.In(FUEL_TYPE_OPTIONS),
-                vol.Optional(CONF_TANKERKOENIG_API_KEY, default=current.get(CONF_TANKERKOENIG_API_KEY, self.config_entry.data.get(CONF_TANKERKOENIG_API_KEY, ""))): str,
-                vol.Optional(CONF_NOTIFY_CHANNELS, default=current.get(CONF_NOTIFY_CHANNELS, self.config_entry.data.get(CONF_NOTIFY_CHANNELS, DEFAULT_NOTIFY_CHANNELS))): list,
-            }
-        )
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("FWCAM options flow: async_step_init called with input: %s", user_input)
+
+        schema = self._get_options_schema()
 
         if user_input is None:
             return self.async_show_form(step_id="init", data_schema=schema)
 
-        _LOGGER.debug("FWCAM options flow: saving options: %s", user_input)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("FWCAM options flow: saving options: %s", user_input)
         return self.async_create_entry(title="", data=user_input)
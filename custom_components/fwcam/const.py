@@ -14,7 +14,7 @@ CONF_TANKERKOENIG_API_KEY = "tankerkoenig_api_key"
 
 DEFAULT_FUEL_TYPE = "e5"
 DEFAULT_RADIUS = 5
-DEFAULT_NOTIFY_CHANNELS = []
+DEFAULT_NOTIFY_CHANNELS: tuple[str, ...] = ()
 
 # Valid fuel types for Tankerkönig API
 FUEL_TYPE_OPTIONS = ["e5", "e10", "diesel", "all"]
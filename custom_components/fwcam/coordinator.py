@@ -2,7 +2,7 @@
 
 #COMMIT TITLE: fix(v0.1.3): robust coordinator using validated config
 #COMMIT DESCRIPTION:
-#• 	Coordinator reads validated config from hass.data and returns a stable placeholder snapshot.
+#• 	Coordinator reads the validated config passed in by async_setup_entry (shared with entry.runtime_data) and returns a stable placeholder snapshot.
 #• 	Avoids assumptions about entry.data and uses safe timestamping. 
 # FILE DESCRIPTION: DataUpdateCoordinator for FWCAM. Periodically fetches data (placeholder) and exposes snapshot. 
 #DEPENDENCIES:
@@ -11,15 +11,18 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
 from typing import Any, Dict, Optional
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CoreState, HomeAssistant
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE, CONF_RADIUS
 
 from .const import DOMAIN, CONF_FUEL_TYPE, CONF_TANKERKOENIG_API_KEY, DEFAULT_FUEL_TYPE
+from .providers.base_provider import ProviderError, ProviderRateLimitError
 from .providers.tankerkoenig import TankerkoenigProvider
 
 _LOGGER = logging.getLogger(__name__)
@@ -27,34 +30,93 @@ _LOGGER = logging.getLogger(__name__)
 DEFAULT_UPDATE_INTERVAL = timedelta(minutes=5)
 FETCH_TIMEOUT = 30
 
+# Failed fetches double the update interval up to MAX_UPDATE_INTERVAL; the
+# configured interval is restored after BACKOFF_RESET_SUCCESSES good fetches.
+MAX_UPDATE_INTERVAL = timedelta(hours=1)
+BACKOFF_RESET_SUCCESSES = 3
+
+# Station data younger than STATIONS_FRESH_TTL seconds is used as-is; older data
+# up to STATIONS_STALE_TTL is served while it is refreshed in the background.
+STATIONS_FRESH_TTL = 120.0
+STATIONS_STALE_TTL = 900.0
+
+
+@dataclass(slots=True)
+class CoordinatorState:
+    """Mutable coordinator state; exported to sensors as a snapshot dict."""
+
+    vehicles: Dict[str, Any] = field(default_factory=dict)
+    forecasts: Dict[str, Any] = field(default_factory=dict)
+    providers: Dict[str, Any] = field(default_factory=dict)
+    refuel_events: list = field(default_factory=list)
+    last_update: Optional[str] = None
+    config: Dict[str, Any] = field(default_factory=dict)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a shallow snapshot dict; consumers must not mutate nested values."""
+        return {
+            "vehicles": self.vehicles,
+            "forecasts": self.forecasts,
+            "providers": self.providers,
+            "refuel_events": self.refuel_events,
+            "last_update": self.last_update,
+            "config": self.config,
+        }
+
 
 class FwcamDataUpdateCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, update_interval: Optional[timedelta] = None) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: FwcamConfigEntry,
+        config: Dict[str, Any],
+        update_interval: Optional[timedelta] = None,
+    ) -> None:
         self.hass = hass
         self.entry = entry
         interval = update_interval or DEFAULT_UPDATE_INTERVAL
 
-        super().__init__(hass, _LOGGER, name=f"{DOMAIN}-{entry.entry_id}", update_interval=interval)
+        # Unchanged polls return the previous snapshot object, so listeners are
+        # only called when the data actually changed
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN}-{entry.entry_id}",
+            update_interval=interval,
+            always_update=False,
+        )
 
-        self._state: Dict[str, Any] = {
-            "vehicles": {},
-            "forecasts": {},
-            "providers": {},
-            "refuel_events": [],
-            "last_update": None,
-            "config": {},
-        }
-        
-        # Initialize Tankerkönig provider
-        api_key = entry.data.get(CONF_TANKERKOENIG_API_KEY, "")
-        self._tankerkoenig_provider = TankerkoenigProvider(api_key) if api_key else None
+        # Validated config, shared by reference with entry.runtime_data
+        self._state = CoordinatorState(config=config)
+        # Latest snapshot (placeholder until the first fetch) and the state
+        # fields changed since it was built
+        self._snapshot: Dict[str, Any] = self._state.as_dict()
+        # Incremented whenever a new snapshot object is built
+        self._snapshot_version = 0
+        self._dirty_fields: set[str] = set()
+        self._tankerkoenig_provider: Optional[TankerkoenigProvider] = None
+        # Monotonic time of the last successful station fetch
+        self._stations_fetched_at: Optional[float] = None
+        self._refresh_lock = asyncio.Lock()
+        # Adaptive polling: consecutive failed / successful station fetches
+        self._base_interval = interval
+        self._fail_streak = 0
+        self._ok_streak = 0
+
+    async def _async_setup(self) -> None:
+        """Initialize providers once, before the first refresh."""
+        api_key = self.entry.data.get(CONF_TANKERKOENIG_API_KEY, "")
+        self._tankerkoenig_provider = TankerkoenigProvider(self.hass, api_key) if api_key else None
 
     async def _async_update_data(self) -> Dict[str, Any]:
         try:
-            return await asyncio.wait_for(self.async_fetch_data(), timeout=FETCH_TIMEOUT)
-        except asyncio.TimeoutError as err:
+            async with asyncio.timeout(FETCH_TIMEOUT):
+                return await self.async_fetch_data()
+        except TimeoutError as err:
             _LOGGER.warning("FWCAM coordinator fetch timed out.")
             raise UpdateFailed("Timeout while fetching FWCAM data") from err
+        except UpdateFailed:
+            raise
         except Exception as err:
             _LOGGER.exception("Unexpected error in coordinator fetch: %s", err)
             raise UpdateFailed(err) from err
@@ -63,74 +125,164 @@ class FwcamDataUpdateCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
         """Fetch data from Tankerkönig API and other sources."""
         _LOGGER.debug("FWCAM coordinator: async_fetch_data called.")
 
-        if not isinstance(self._state, dict):
-            self._state = {
-                "vehicles": {},
-                "forecasts": {},
-                "providers": {},
-                "refuel_events": [],
-                "last_update": None,
-                "config": {},
-            }
-
-        config = self.hass.data.get(DOMAIN, {}).get(self.entry.entry_id, {}).get("config", {})
-        self._state["config"] = config
-
-        # Fetch station data from Tankerkönig API
-        if self._tankerkoenig_provider:
-            try:
-                latitude = config.get("latitude") or self.entry.data.get(CONF_LATITUDE)
-                longitude = config.get("longitude") or self.entry.data.get(CONF_LONGITUDE)
-                radius = config.get("radius") or self.entry.data.get(CONF_RADIUS, 5)
-                fuel_type = config.get("fuel_type") or self.entry.data.get(CONF_FUEL_TYPE, DEFAULT_FUEL_TYPE)
-                
-                if latitude is not None and longitude is not None:
-                    _LOGGER.debug(
-                        "Fetching stations from Tankerkönig: lat=%s, lng=%s, radius=%s, fuel_type=%s",
-                        latitude,
-                        longitude,
-                        radius,
-                        fuel_type,
-                    )
-                    stations = await self._tankerkoenig_provider.fetch_stations(
-                        float(latitude),
-                        float(longitude),
-                        int(radius),
-                        str(fuel_type),
+        # Fetch station data from Tankerkönig API. While Home Assistant is still
+        # starting the placeholder snapshot is returned; the refresh scheduled
+        # at startup fetches the real data.
+        if self._tankerkoenig_provider and self.hass.state is not CoreState.running:
+            _LOGGER.debug("Home Assistant is starting; deferring Tankerkönig fetch")
+        elif self._tankerkoenig_provider:
+            # Stale-while-revalidate: fresh data is used as-is, stale data is
+            # served while a background task refreshes it, and only missing or
+            # expired data is awaited.
+            age = (
+                None
+                if self._stations_fetched_at is None
+                else time.monotonic() - self._stations_fetched_at
+            )
+            if age is not None and age < STATIONS_FRESH_TTL:
+                _LOGGER.debug("Using fresh Tankerkönig data (age %.0f s)", age)
+            elif age is not None and age < STATIONS_STALE_TTL:
+                if not self._refresh_lock.locked():
+                    self.entry.async_create_background_task(
+                        self.hass, self._async_revalidate_stations(), "fwcam-swr"
                     )
-                    self._state["providers"]["tankerkoenig"] = {
-                        "stations": stations,
-                        "count": len(stations),
-                    }
-                    _LOGGER.info("Successfully fetched %d valid stations from Tankerkönig", len(stations))
-                else:
-                    _LOGGER.warning("Cannot fetch Tankerkönig data: missing coordinates")
+            else:
+                await self._async_refresh_stations()
+        else:
+            _LOGGER.debug("Tankerkönig provider not initialized (missing API key)")
+
+        return self._build_snapshot()
+
+    async def _async_refresh_stations(self) -> None:
+        """Fetch stations from Tankerkönig into the coordinator state.
+
+        Raises UpdateFailed when the fetch fails and no earlier stations are
+        left to serve.
+        """
+        # Coordinates and radius are always set by async_setup_entry
+        config = self._state.config
+        latitude = config[CONF_LATITUDE]
+        longitude = config[CONF_LONGITUDE]
+        radius = config[CONF_RADIUS]
+        fuel_type = config.get(CONF_FUEL_TYPE, DEFAULT_FUEL_TYPE)
+
+        async with self._refresh_lock:
+            if (
+                self._stations_fetched_at is not None
+                and time.monotonic() - self._stations_fetched_at < STATIONS_FRESH_TTL
+            ):
+                _LOGGER.debug("Tankerkönig data was refreshed while waiting; skipping fetch")
+                return
+            try:
+                _LOGGER.debug(
+                    "Fetching stations from Tankerkönig: lat=%s, lng=%s, radius=%s, fuel_type=%s",
+                    latitude,
+                    longitude,
+                    radius,
+                    fuel_type,
+                )
+                stations = await self._tankerkoenig_provider.fetch_stations(
+                    latitude, longitude, radius, fuel_type
+                )
+                # Rebind rather than mutate: the published snapshot shares this dict
+                self._state.providers = {
+                    **self._state.providers,
+                    "tankerkoenig": {"stations": stations, "count": len(stations)},
+                }
+                self._dirty_fields.add("providers")
+                self._stations_fetched_at = time.monotonic()
+                self._record_fetch_success()
+                _LOGGER.info("Successfully fetched %d valid stations from Tankerkönig", len(stations))
+            except ProviderError as err:
+                self._set_stations_error(err)
+                if self._stations_fetched_at is None:
+                    # No stations to fall back on: fail the update, which turns
+                    # the first refresh into ConfigEntryNotReady
+                    raise UpdateFailed(f"Error fetching Tankerkönig data: {err}") from err
+                _LOGGER.warning("Error fetching Tankerkönig data: %s", err)
             except Exception as err:
                 _LOGGER.exception("Error fetching Tankerkönig data: %s", err)
-                self._state["providers"]["tankerkoenig"] = {
-                    "stations": [],
-                    "count": 0,
-                    "error": str(err),
-                }
+                self._set_stations_error(err)
+                if self._stations_fetched_at is None:
+                    raise UpdateFailed(f"Error fetching Tankerkönig data: {err}") from err
+
+    def _set_stations_error(self, err: Exception) -> None:
+        """Record a failed station fetch and back off the update interval."""
+        age = (
+            None
+            if self._stations_fetched_at is None
+            else time.monotonic() - self._stations_fetched_at
+        )
+        previous = self._state.providers.get("tankerkoenig")
+        if previous and age is not None and age < STATIONS_STALE_TTL:
+            # Keep serving the last good stations until they expire
+            tankerkoenig = {**previous, "error": str(err)}
         else:
-            _LOGGER.debug("Tankerkönig provider not initialized (missing API key)")
+            tankerkoenig = {"stations": [], "count": 0, "error": str(err)}
+            # Await a fresh fetch on the next update instead of serving the error
+            self._stations_fetched_at = None
+        self._state.providers = {**self._state.providers, "tankerkoenig": tankerkoenig}
+        self._dirty_fields.add("providers")
+
+        self._ok_streak = 0
+        self._fail_streak += 1
+        interval = min(self._base_interval * (2 ** self._fail_streak), MAX_UPDATE_INTERVAL)
+        if isinstance(err, ProviderRateLimitError) and err.retry_after is not None:
+            interval = max(interval, timedelta(seconds=err.retry_after))
+        self.update_interval = interval
+        _LOGGER.debug(
+            "Tankerkönig fetch failed %d time(s) in a row; next update in %s",
+            self._fail_streak,
+            interval,
+        )
 
+    def _record_fetch_success(self) -> None:
+        """Restore the configured update interval after enough successful fetches."""
+        self._ok_streak += 1
+        if self._fail_streak and self._ok_streak >= BACKOFF_RESET_SUCCESSES:
+            _LOGGER.debug("Tankerkönig fetches recovered; restoring update interval %s", self._base_interval)
+            self._fail_streak = 0
+            self.update_interval = self._base_interval
+
+    async def _async_revalidate_stations(self) -> None:
+        """Refresh stale station data in the background and publish the result."""
         try:
-            self._state["last_update"] = datetime.now(timezone.utc).isoformat()
-        except Exception:
-            self._state["last_update"] = str(datetime.utcnow())
-
-        snapshot = {
-            "vehicles": self._state.get("vehicles", {}),
-            "forecasts": self._state.get("forecasts", {}),
-            "providers": self._state.get("providers", {}),
-            "refuel_events": self._state.get("refuel_events", []),
-            "last_update": self._state.get("last_update"),
-            "config": self._state.get("config", {}),
-        }
+            await self._async_refresh_stations()
+        except UpdateFailed as err:
+            # The stale stations expired while the request was in flight
+            self.async_set_update_error(err)
+            return
+        self.async_set_updated_data(self._build_snapshot())
 
-        return snapshot
+    def _build_snapshot(self) -> Dict[str, Any]:
+        """Return the snapshot exposed to sensors.
+
+        The snapshot is only rebuilt (and ``last_update`` stamped) when a state
+        field changed; otherwise the previous snapshot object is returned as-is.
+        """
+        if self._dirty_fields:
+            self._state.last_update = datetime.now(timezone.utc).isoformat(timespec="seconds")
+            self._snapshot = self._state.as_dict()
+            self._snapshot_version += 1
+            self._dirty_fields.clear()
+        return self._snapshot
 
     @property
     def snapshot(self) -> Dict[str, Any]:
-        return self.data or self._state
+        return self._snapshot
+
+    @property
+    def snapshot_version(self) -> int:
+        """Version of the current snapshot; changes whenever it is rebuilt."""
+        return self._snapshot_version
+
+
+@dataclass(slots=True)
+class FwcamRuntimeData:
+    """Per-entry runtime state stored on the config entry."""
+
+    coordinator: FwcamDataUpdateCoordinator
+    config: Dict[str, Any]
+
+
+FwcamConfigEntry = ConfigEntry[FwcamRuntimeData]
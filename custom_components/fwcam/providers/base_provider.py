@@ -1,22 +1,32 @@
 """Base provider class for fuel station price providers."""
 from __future__ import annotations
 
-from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Protocol
 
 
-class BaseFuelProvider(ABC):
-    """Abstract base class for fuel station price providers."""
+class ProviderError(Exception):
+    """Raised when a provider request fails."""
 
-    def __init__(self, api_key: str) -> None:
-        """Initialize the provider with an API key.
+
+class ProviderRateLimitError(ProviderError):
+    """Raised when a provider rejects a request because of rate limiting."""
+
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        """Initialize the error.
         
         Args:
-            api_key: API key for the provider service
+            message: Error description
+            retry_after: Seconds the provider asked to wait, if it said so
         """
-        self.api_key = api_key
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class BaseFuelProvider(Protocol):
+    """Interface implemented by fuel station price providers."""
+
+    api_key: str
 
-    @abstractmethod
     async def fetch_stations(
         self,
         latitude: float,
@@ -34,10 +44,12 @@ class BaseFuelProvider(ABC):
             
         Returns:
             List of station dictionaries with price information
+            
+        Raises:
+            ProviderError: If the provider request failed
         """
-        pass
+        ...
 
-    @abstractmethod
     def validate_station(self, station: dict[str, Any]) -> bool:
         """Validate that a station has valid price information.
         
@@ -47,4 +59,4 @@ class BaseFuelProvider(ABC):
         Returns:
             True if station has valid prices, False otherwise
         """
-        pass
+        ...
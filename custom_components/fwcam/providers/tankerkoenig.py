@@ -1,29 +1,74 @@
 """Tankerkönig API provider for fuel station prices."""
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
 import aiohttp
 
-from .base_provider import BaseFuelProvider
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util.json import json_loads
+
+from .base_provider import ProviderError, ProviderRateLimitError
 
 _LOGGER = logging.getLogger(__name__)
 
 API_BASE_URL = "https://creativecommons.tankerkoenig.de/api/v4"
 
+# Seconds before a stations request is abandoned; kept below the coordinator's
+# FETCH_TIMEOUT so a hung request surfaces as ProviderError (and triggers the
+# polling backoff) instead of being cancelled by the outer timeout
+REQUEST_TIMEOUT = 20
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Return the delay of a Retry-After header given in seconds, if any."""
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        # HTTP-date form; fall back to the coordinator's own backoff
+        return None
+
+
+def usable_price(prices: dict[str, Any], fuel_type: str) -> float | None:
+    """Return the price of ``fuel_type`` if it is a real price, else None.
+    
+    Per the API specification a real price is numeric and greater than 0;
+    Tankerkönig reports unavailable fuels as false/null, and malformed values
+    such as strings are treated the same way.
+    """
+    price = prices.get(fuel_type)
+    if isinstance(price, (int, float)) and not isinstance(price, bool) and price > 0:
+        return price
+    return None
 
-class TankerkoenigProvider(BaseFuelProvider):
-    """Provider for Tankerkönig fuel station price API."""
 
-    def __init__(self, api_key: str) -> None:
+class TankerkoenigProvider:
+    """Provider for Tankerkönig fuel station price API (a BaseFuelProvider)."""
+
+    _STATIONS_URL = f"{API_BASE_URL}/stations"
+    _FUEL_KEYS = ("e5", "e10", "diesel")
+    _REQUIRED = frozenset(("id", "name", "brand", "lat", "lng"))
+    # Station fields kept after validation; the rest of the payload is dropped
+    _STATION_FIELDS = (
+        "id", "name", "brand", "street", "houseNumber", "postCode",
+        "place", "lat", "lng", "dist", "isOpen", "price",
+    )
+
+    def __init__(self, hass: HomeAssistant, api_key: str) -> None:
         """Initialize the Tankerkönig provider.
         
         Args:
+            hass: Home Assistant instance, whose shared HTTP session is used
             api_key: Tankerkönig API key
         """
-        super().__init__(api_key)
-        self._session: aiohttp.ClientSession | None = None
+        self.api_key = api_key
+        self.hass = hass
+        self._base_params = {"apikey": api_key}
 
     async def fetch_stations(
         self,
@@ -47,17 +92,18 @@ class TankerkoenigProvider(BaseFuelProvider):
             
         Returns:
             List of valid stations with price information
+            
+        Raises:
+            ProviderRateLimitError: If the API answered with HTTP 429
+            ProviderError: If the request failed or the API reported an error
         """
         # Ensure radius is within API limits
         radius = min(radius, 25)
-        
-        url = f"{API_BASE_URL}/stations"
-        params = {
+        params = self._base_params | {
             "lat": latitude,
             "lng": longitude,
             "radius": radius,
             "type": fuel_type,
-            "apikey": self.api_key,
         }
         
         _LOGGER.debug(
@@ -69,40 +115,35 @@ class TankerkoenigProvider(BaseFuelProvider):
         )
         
         try:
-            if self._session is None:
-                self._session = aiohttp.ClientSession()
-            
-            async with self._session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=30)) as response:
+            session = async_get_clientsession(self.hass)
+            async with asyncio.timeout(REQUEST_TIMEOUT), session.get(self._STATIONS_URL, params=params) as response:
+                if response.status == 429:
+                    raise ProviderRateLimitError(
+                        "Tankerkönig API rate limit exceeded",
+                        _parse_retry_after(response.headers.get("Retry-After")),
+                    )
                 if response.status != 200:
-                    _LOGGER.error(
-                        "Tankerkönig API returned status %s: %s",
-                        response.status,
-                        await response.text(),
+                    raise ProviderError(
+                        f"Tankerkönig API returned status {response.status}: {await response.text()}"
                     )
-                    return []
                 
-                data = await response.json()
+                # Decode with Home Assistant's orjson-backed loader
+                data = await response.json(loads=json_loads)
                 
                 # Validate response structure according to API spec
                 if not data.get("ok"):
-                    _LOGGER.error("Tankerkönig API returned ok=false: %s", data.get("msg"))
-                    return []
+                    raise ProviderError(f"Tankerkönig API returned ok=false: {data.get('msg')}")
                 
                 # Extract stations from data.stations (API v4 structure)
                 stations = data.get("data", {}).get("stations", [])
                 _LOGGER.debug("Received %d stations from Tankerkönig API", len(stations))
                 
                 # Filter and validate stations to only return those with valid prices
-                valid_stations = []
-                for station in stations:
-                    if self.validate_station(station):
-                        valid_stations.append(station)
-                    else:
-                        _LOGGER.debug(
-                            "Station '%s' (id=%s) excluded - no valid price data",
-                            station.get("name", "Unknown"),
-                            station.get("id", "Unknown"),
-                        )
+                valid_stations = [
+                    {k: s.get(k) for k in self._STATION_FIELDS}
+                    for s in stations
+                    if self.validate_station(s)
+                ]
                 
                 _LOGGER.info(
                     "Tankerkönig: %d valid stations found (out of %d total)",
@@ -112,12 +153,12 @@ class TankerkoenigProvider(BaseFuelProvider):
                 
                 return valid_stations
                 
+        except TimeoutError as err:
+            raise ProviderError(
+                f"Timeout fetching Tankerkönig data after {REQUEST_TIMEOUT} seconds"
+            ) from err
         except aiohttp.ClientError as err:
-            _LOGGER.error("Error connecting to Tankerkönig API: %s", err)
-            return []
-        except Exception as err:
-            _LOGGER.exception("Unexpected error fetching Tankerkönig data: %s", err)
-            return []
+            raise ProviderError(f"Error connecting to Tankerkönig API: {err}") from err
 
     def validate_station(self, station: dict[str, Any]) -> bool:
         """Validate that a station has valid price information.
@@ -135,39 +176,19 @@ class TankerkoenigProvider(BaseFuelProvider):
         if not isinstance(station, dict):
             return False
         
-        # Check if price object exists
         price = station.get("price")
-        if not isinstance(price, dict):
-            _LOGGER.debug("Station has no price object")
-            return False
-        
-        # Check if at least one valid price exists
-        # Valid means: exists, is numeric, and is greater than 0
-        has_valid_price = False
-        for fuel_type in ["e5", "e10", "diesel"]:
-            fuel_price = price.get(fuel_type)
-            if fuel_price is not None and isinstance(fuel_price, (int, float)) and fuel_price > 0:
-                has_valid_price = True
-                break
+        # At least one fuel must have a usable price; malformed values reject
+        # the station instead of raising
+        valid = (
+            isinstance(price, dict)
+            and any(usable_price(price, k) is not None for k in self._FUEL_KEYS)
+            and self._REQUIRED.issubset(station)
+        )
         
-        if not has_valid_price:
+        if not valid and _LOGGER.isEnabledFor(logging.DEBUG):
             _LOGGER.debug(
-                "Station has price object but no valid prices: %s",
-                price,
+                "Station '%s' (id=%s) excluded - no valid price data or missing fields",
+                station.get("name", "Unknown"),
+                station.get("id", "Unknown"),
             )
-            return False
-        
-        # Ensure station has required fields
-        required_fields = ["id", "name", "brand", "lat", "lng"]
-        for field in required_fields:
-            if field not in station:
-                _LOGGER.debug("Station missing required field: %s", field)
-                return False
-        
-        return True
-
-    async def close(self) -> None:
-        """Close the HTTP session."""
-        if self._session:
-            await self._session.close()
-            self._session = None
+        return valid
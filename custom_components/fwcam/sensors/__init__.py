@@ -1,20 +1,22 @@
 """Sensor platform for FWCAM integration."""
 from __future__ import annotations
 
+import asyncio
+
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.config_entries import ConfigEntry
 
+from ..coordinator import FwcamConfigEntry
 from . import consumption_sensor
 from . import station_sensor
 
 
 async def async_setup_entry(
-    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+    hass: HomeAssistant, entry: FwcamConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     """Set up FWCAM sensors from a config entry."""
-    # Setup consumption sensor
-    await consumption_sensor.async_setup_entry(hass, entry, async_add_entities)
-    
-    # Setup station sensor
-    await station_sensor.async_setup_entry(hass, entry, async_add_entities)
+    # Consumption and station sensors are independent; set them up together
+    await asyncio.gather(
+        consumption_sensor.async_setup_entry(hass, entry, async_add_entities),
+        station_sensor.async_setup_entry(hass, entry, async_add_entities),
+    )
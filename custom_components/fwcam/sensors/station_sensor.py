@@ -2,32 +2,40 @@
 from __future__ import annotations
 
 import logging
+from operator import itemgetter
+from types import MappingProxyType
 from typing import Any
 
+from homeassistant.components.sensor import SensorEntity
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from ..const import DOMAIN
-from ..coordinator import FwcamDataUpdateCoordinator
+from ..const import DEFAULT_FUEL_TYPE
+from ..coordinator import FwcamConfigEntry, FwcamDataUpdateCoordinator
+from ..providers.tankerkoenig import usable_price
 
 _LOGGER = logging.getLogger(__name__)
 
+# Fuel types compared when the configured fuel type is "all"
+_ALL_FUEL_TYPES: tuple[str, ...] = ("e5", "e10", "diesel")
+_INF = float("inf")
+
+# Number of cheapest stations exported in the all_stations attribute
+_MAX_LISTED_STATIONS = 10
+
 
 async def async_setup_entry(
-    hass: HomeAssistant, entry, async_add_entities: AddEntitiesCallback
+    hass: HomeAssistant, entry: FwcamConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     """Set up station sensor for a config entry."""
-    coordinator: FwcamDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id][
-        "coordinator"
-    ]
+    coordinator = entry.runtime_data.coordinator
 
     # Create a sensor for the recommended station
-    async_add_entities([FwcamStationSensor(coordinator, entry.entry_id)], True)
+    async_add_entities([FwcamStationSensor(coordinator, entry.entry_id)])
 
 
-class FwcamStationSensor(CoordinatorEntity, Entity):
+class FwcamStationSensor(CoordinatorEntity, SensorEntity):
     """Sensor displaying the recommended fuel station with best price."""
 
     _attr_should_poll = False
@@ -37,22 +45,15 @@ class FwcamStationSensor(CoordinatorEntity, Entity):
     ) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
-        self.coordinator = coordinator
         self.entry_id = entry_id
         self._attr_name = "FWCAM Recommended Station"
         self._attr_unique_id = f"fwcam_recommended_station_{entry_id}"
-        self._state: Any = None
-        self._attributes: dict[str, Any] = {}
-
-    @property
-    def native_value(self):
-        """Return the station name with best price."""
-        return self._state
-
-    @property
-    def extra_state_attributes(self) -> dict:
-        """Return additional attributes about the station and all available stations."""
-        return self._attributes
+        self._attr_extra_state_attributes = MappingProxyType({})
+        # (available, state, attributes) last written to Home Assistant
+        self._prev: tuple[bool, Any, dict[str, Any]] | None = None
+        # all_stations attribute and the snapshot version it was built from
+        self._all_stations: list[dict[str, Any]] = []
+        self._all_stations_version: int | None = None
 
     async def async_added_to_hass(self) -> None:
         """When entity is added, ensure we have initial state and subscribe to updates."""
@@ -60,54 +61,75 @@ class FwcamStationSensor(CoordinatorEntity, Entity):
         # Initial update from coordinator snapshot
         self._handle_coordinator_update()
 
+    def _get_all_stations(
+        self, stations: list[dict[str, Any]], fuels: tuple[str, ...]
+    ) -> list[dict[str, Any]]:
+        """Return the cheapest stations for ``fuels``, rebuilt only for a new snapshot."""
+        version = self.coordinator.snapshot_version
+        if version != self._all_stations_version:
+            ranked = sorted(
+                stations,
+                key=lambda s: min(
+                    (
+                        p
+                        for ft in fuels
+                        if (p := usable_price(s["price"], ft)) is not None
+                    ),
+                    default=_INF,
+                ),
+            )[:_MAX_LISTED_STATIONS]
+            self._all_stations = [
+                {
+                    "name": s.get("name"),
+                    "brand": s.get("brand"),
+                    "place": s.get("place"),
+                    "distance": s.get("dist"),
+                    "e5": s["price"].get("e5"),
+                    "e10": s["price"].get("e10"),
+                    "diesel": s["price"].get("diesel"),
+                    "is_open": s.get("isOpen"),
+                }
+                for s in ranked
+            ]
+            self._all_stations_version = version
+        return self._all_stations
+
     def _handle_coordinator_update(self) -> None:
         """Read snapshot from coordinator and update internal state."""
         snapshot = self.coordinator.snapshot
 
         # Get Tankerkönig station data
-        providers = snapshot.get("providers", {})
-        tankerkoenig_data = providers.get("tankerkoenig", {})
-        stations = tankerkoenig_data.get("stations", [])
+        providers = snapshot.get("providers")
+        tankerkoenig_data = providers.get("tankerkoenig") if providers else None
+        stations = tankerkoenig_data.get("stations") if tankerkoenig_data else None
 
         if not stations:
-            self._state = "No stations available"
-            self._attributes = {
+            state = "No stations available"
+            attributes = {
                 "station_count": 0,
-                "error": tankerkoenig_data.get("error", "No data"),
+                "error": tankerkoenig_data.get("error", "No data") if tankerkoenig_data else "No data",
             }
         else:
             # Get configured fuel type
-            config = snapshot.get("config", {})
-            fuel_type = config.get("fuel_type", "e5")
-
-            # Find the station with the best price for the configured fuel type
-            best_station = None
-            best_price = float("inf")
-            selected_fuel_type = None
-            selected_price = None
-
-            for station in stations:
-                price_obj = station.get("price", {})
-                if fuel_type == "all":
-                    # For "all" type, find the cheapest among all fuel types
-                    for ft in ["e5", "e10", "diesel"]:
-                        price = price_obj.get(ft)
-                        if price and price < best_price:
-                            best_price = price
-                            best_station = station
-                            selected_fuel_type = ft
-                            selected_price = price
-                else:
-                    price = price_obj.get(fuel_type)
-                    if price and price < best_price:
-                        best_price = price
-                        best_station = station
-                        selected_fuel_type = fuel_type
-                        selected_price = price
-
-            if best_station:
-                self._state = best_station.get("name", "Unknown Station")
-                self._attributes = {
+            config = snapshot.get("config")
+            fuel_type = config.get("fuel_type", DEFAULT_FUEL_TYPE) if config else DEFAULT_FUEL_TYPE
+
+            # Find the station with the best price for the configured fuel type;
+            # for "all", the cheapest among all fuel types
+            fuels = _ALL_FUEL_TYPES if fuel_type == "all" else (fuel_type,)
+            candidates = [
+                (price, ft, station)
+                for station in stations
+                for ft in fuels
+                if (price := usable_price(station["price"], ft)) is not None
+            ]
+            best = min(candidates, key=itemgetter(0), default=None)
+
+            if best is not None:
+                best_price, selected_fuel_type, best_station = best
+                best_prices = best_station["price"]
+                state = best_station.get("name", "Unknown Station")
+                attributes = {
                     "station_id": best_station.get("id"),
                     "brand": best_station.get("brand"),
                     "street": best_station.get("street"),
@@ -119,38 +141,35 @@ class FwcamStationSensor(CoordinatorEntity, Entity):
                     "distance": best_station.get("dist"),
                     "is_open": best_station.get("isOpen"),
                     "fuel_type": selected_fuel_type,
-                    "price": selected_price,
-                    "e5_price": best_station.get("price", {}).get("e5"),
-                    "e10_price": best_station.get("price", {}).get("e10"),
-                    "diesel_price": best_station.get("price", {}).get("diesel"),
+                    "price": best_price,
+                    "e5_price": best_prices.get("e5"),
+                    "e10_price": best_prices.get("e10"),
+                    "diesel_price": best_prices.get("diesel"),
                     "station_count": len(stations),
-                    "all_stations": [
-                        {
-                            "name": s.get("name"),
-                            "brand": s.get("brand"),
-                            "place": s.get("place"),
-                            "distance": s.get("dist"),
-                            "e5": s.get("price", {}).get("e5"),
-                            "e10": s.get("price", {}).get("e10"),
-                            "diesel": s.get("price", {}).get("diesel"),
-                            "is_open": s.get("isOpen"),
-                        }
-                        for s in stations
-                    ],
+                    "all_stations": self._get_all_stations(stations, fuels),
                 }
                 _LOGGER.debug(
                     "Best station: %s at €%.3f for %s (%d stations available)",
-                    self._state,
+                    state,
                     best_price,
                     selected_fuel_type,
                     len(stations),
                 )
             else:
-                self._state = "No valid prices found"
-                self._attributes = {
+                state = "No valid prices found"
+                attributes = {
                     "station_count": len(stations),
                     "error": "No valid prices for selected fuel type",
                 }
 
+        # Skip the state write when nothing changed
+        current = (self.available, state, attributes)
+        if current == self._prev:
+            return
+        # Read-only view so the published attributes cannot be mutated in place
+        self._attr_native_value = state
+        self._attr_extra_state_attributes = MappingProxyType(attributes)
+        self._prev = current
+
         # Notify HA of state change
         self.async_write_ha_state()